@@ -1,14 +1,33 @@
 from typing import Any, List, Dict, Optional, Union
 import os
+import re
+import select
 import argparse
+import asyncio
+import functools
+import hashlib
+import io
+import itertools
+import logging
+import math
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields, replace
 import psycopg2
-from psycopg2 import Error
-from psycopg2.extras import RealDictCursor
+from psycopg2 import Error, errorcodes, sql
+from psycopg2.extras import execute_values
+from psycopg2.pool import PoolError, ThreadedConnectionPool
 from mcp.server.fastmcp import FastMCP
 
 # 初始化 FastMCP server
 mcp = FastMCP("postgresql")
 
+# stdio 模式下标准输出用于 MCP 协议通信，日志通过 logging 输出到标准错误
+logger = logging.getLogger(__name__)
+
 # 解析命令行参数
 def parse_args():
     parser = argparse.ArgumentParser(description='PostgreSQL MCP服务')
@@ -21,16 +40,58 @@ def parse_args():
     parser.add_argument('--connect-retry-count', type=int, help='连接重试次数')
     return parser.parse_args()
 
+@dataclass(frozen=True, slots=True)
+class DbConfig:
+    """数据库连接配置"""
+    host: str
+    port: int
+    user: str
+    password: str
+    database: str
+    connect_timeout: int = 10  # 连接超时时间(秒)
+    connect_retry_count: int = 3  # 连接重试次数
+    statement_timeout: int = 30000  # 语句执行超时时间(毫秒)，0为沿用服务器设置
+    idle_in_transaction_timeout: int = 60000  # 事务空闲超时时间(毫秒)，0为沿用服务器设置
+    extra: frozenset = frozenset()  # 其他 libpq 连接参数(如 sslmode、application_name)的 (名称, 值) 对
+
+    def conn_params(self):
+        """传给 psycopg2.connect 的连接参数"""
+        params = {
+            "host": self.host,
+            "port": self.port,
+            "user": self.user,
+            "password": self.password,
+            "database": self.database,
+            "connect_timeout": self.connect_timeout,
+            # TCP keepalive，网络中断时尽快发现失效的连接，而不是等待系统的TCP超时
+            "keepalives": 1,
+            "keepalives_idle": 30,
+            "keepalives_interval": 10,
+            "keepalives_count": 3,
+        }
+        # 只发送需要修改的服务端参数；两个超时都为0时不发送 options(pgbouncer 等连接池不接受该启动参数)
+        settings = []
+        if self.statement_timeout:
+            settings.append(f"-c statement_timeout={self.statement_timeout}")
+        if self.idle_in_transaction_timeout:
+            settings.append(f"-c idle_in_transaction_session_timeout={self.idle_in_transaction_timeout}")
+        if settings:
+            params["options"] = " ".join(settings)
+        params.update(self.extra)
+        return params
+
 # 数据库连接配置默认值
-DEFAULT_DB_CONFIG = {
-    "host": os.getenv("POSTGRES_HOST", "localhost"),
-    "port": int(os.getenv("POSTGRES_PORT", "5432")),
-    "user": os.getenv("POSTGRES_USER", "postgres"),
-    "password": os.getenv("POSTGRES_PASSWORD", "postgres"),
-    "database": os.getenv("POSTGRES_DATABASE", "postgres"),
-    "connect_timeout": int(os.getenv("POSTGRES_CONNECTION_TIMEOUT", "10")),  # 连接超时时间(秒)
-    "connect_retry_count": int(os.getenv("POSTGRES_CONNECT_RETRY_COUNT", "3"))  # 连接重试次数
-}
+DEFAULT_DB_CONFIG = DbConfig(
+    host=os.getenv("POSTGRES_HOST", "localhost"),
+    port=int(os.getenv("POSTGRES_PORT", "5432")),
+    user=os.getenv("POSTGRES_USER", "postgres"),
+    password=os.getenv("POSTGRES_PASSWORD", "postgres"),
+    database=os.getenv("POSTGRES_DATABASE", "postgres"),
+    connect_timeout=int(os.getenv("POSTGRES_CONNECTION_TIMEOUT", "10")),  # 连接超时时间(秒)
+    connect_retry_count=int(os.getenv("POSTGRES_CONNECT_RETRY_COUNT", "3")),  # 连接重试次数
+    statement_timeout=int(os.getenv("POSTGRES_STATEMENT_TIMEOUT", "30000")),  # 语句执行超时时间(毫秒)
+    idle_in_transaction_timeout=int(os.getenv("POSTGRES_IDLE_IN_TRANSACTION_TIMEOUT", "60000"))  # 事务空闲超时时间(毫秒)
+)
 
 # 从命令行参数获取配置
 def get_config_from_args():
@@ -53,14 +114,258 @@ def get_config_from_args():
         cmd_config["connect_retry_count"] = args.connect_retry_count
     
     # 合并配置
-    config = DEFAULT_DB_CONFIG.copy()
-    config.update(cmd_config)
-    
-    return config
+    return replace(DEFAULT_DB_CONFIG, **cmd_config)
 
 # 全局数据库配置
 GLOBAL_DB_CONFIG = None
 
+# 连接池配置，每组连接参数对应一个连接池
+POOL_MIN_CONN = int(os.getenv("POSTGRES_POOL_MIN", "1"))
+POOL_MAX_CONN = int(os.getenv("POSTGRES_POOL_MAX", "16"))
+
+# 最多保留的连接池数量(每组不同的连接配置对应一个连接池)，超出时淘汰最久未使用的连接池
+POOL_CACHE_SIZE = 8
+
+_POOLS: "OrderedDict[DbConfig, IdleConnectionPool]" = OrderedDict()
+_POOLS_LOCK = threading.Lock()
+
+# 建立连接时不会因重试而恢复的错误(这类错误没有 SQLSTATE，只能根据错误信息判断)
+_PERMANENT_CONNECT_ERRORS = ("password authentication failed", "does not exist", "no pg_hba.conf entry")
+
+# 执行阻塞数据库操作的线程池，线程数与连接池上限一致，并发调用不会超出可用连接
+_EXECUTOR = ThreadPoolExecutor(max_workers=POOL_MAX_CONN, thread_name_prefix="postgresql-mcp")
+
+# execute_query 在每个连接上缓存的预处理语句数量，设为0可关闭(如通过 pgbouncer 事务模式连接时)
+STATEMENT_CACHE_SIZE = int(os.getenv("POSTGRES_STATEMENT_CACHE_SIZE", "256"))
+
+# 返回结果集的语句类型
+_READ_VERBS = frozenset({"SELECT", "SHOW", "DESCRIBE", "EXPLAIN", "WITH", "VALUES", "TABLE"})
+
+# 元数据查询结果(表、表结构、模式列表)的缓存时间(秒)，设为0可关闭
+METADATA_CACHE_TTL = float(os.getenv("POSTGRES_METADATA_CACHE_TTL", "60"))
+METADATA_CACHE_SIZE = 256
+
+_METADATA_CACHE: Dict[tuple, tuple] = {}
+_METADATA_CACHE_LOCK = threading.Lock()
+
+# 可能修改表结构的语句类型，执行后需要清空元数据缓存
+_DDL_VERBS = frozenset({"CREATE", "ALTER", "DROP", "TRUNCATE", "COMMENT", "RENAME", "IMPORT", "DO"})
+
+# 可以通过服务端游标(DECLARE)分批读取结果的语句类型
+_SERVER_CURSOR_VERBS = frozenset({"SELECT", "VALUES", "TABLE"})
+
+# 服务端游标每次从服务器读取的行数
+FETCH_SIZE = 10000
+
+# 可能释放会话中预处理语句的语句类型，执行后需要清空预处理语句缓存
+_DEALLOCATE_VERBS = frozenset({"DEALLOCATE", "DISCARD"})
+
+# 可以使用 PREPARE 的语句类型
+_PREPARABLE_VERBS = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE", "MERGE", "VALUES", "WITH", "TABLE"})
+
+# insert_data 每条多行INSERT语句包含的最大行数
+INSERT_PAGE_SIZE = 1000
+
+# insert_data 超过该行数时改用 COPY FROM STDIN 写入
+COPY_THRESHOLD = 5000
+
+# 可以直接以文本形式写入 COPY 数据流的值类型(JSON 中的标量)，以及写入结果与 INSERT 相同的列类型
+# 字符串和 NULL 在两种方式下都由列类型的输入函数解析，不限列类型(None)；
+# 布尔值和数字在 INSERT 中是带类型的常量，会按赋值转换(如 1.5 写入 integer 列时四舍五入，true 写入 jsonb 列时报错)，
+# 只允许转换结果与文本解析一致的列类型
+_COPY_COLUMN_TYPES = {
+    type(None): None,
+    str: None,
+    bool: frozenset({"boolean", "text", "character varying"}),
+    int: frozenset({"smallint", "integer", "bigint", "numeric", "real", "double precision",
+                    "text", "character varying"}),
+    float: frozenset({"numeric", "real", "double precision"}),
+}
+
+# create_table/insert_data/update_data 接受的表名、模式名和列名
+_IDENT_RE = re.compile(r"[^\W\d]\w{0,62}")
+
+# SQL语句的第一个关键字
+_FIRST_WORD_RE = re.compile(r"\s*([A-Za-z]+)")
+
+# ORDER BY/GROUP BY/DISTINCT ON 中的整数常量表示列序号，换成参数后含义不同，这类查询不使用 PREPARE
+_POSITIONAL_PLACEHOLDER_RE = re.compile(
+    r"\b(?:ORDER|GROUP)\s+BY\b(?:(?!\b(?:LIMIT|OFFSET|FETCH|FOR|HAVING|WINDOW)\b).)*?%s"
+    r"|\bDISTINCT\s+ON\s*\([^)]*%s",
+    re.I | re.S
+)
+
+# psycopg2 的占位符(%s)及转义(%%)
+_PLACEHOLDER_RE = re.compile(r"%(.)", re.S)
+
+# 连接归还连接池前执行，相当于不含 DEALLOCATE ALL 的 DISCARD ALL
+_SESSION_RESET_SQL = (
+    "SET SESSION AUTHORIZATION DEFAULT; RESET ALL; UNLISTEN *; "
+    "SELECT pg_advisory_unlock_all(); DISCARD TEMP; DISCARD SEQUENCES"
+)
+
+class StatementCachingConnection(psycopg2.extensions.connection):
+    """记录已在服务端 PREPARE 过的语句的连接，按 LRU 顺序保存 (SQL 文本, 参数类型) 到语句名的映射"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.statement_cache = OrderedDict()
+
+def connection_lost(conn):
+    """判断空闲连接是否已被服务器关闭，不需要与服务器往返
+
+    空闲连接上不应有待读取的数据，可读说明服务器已发送终止消息(如重启、pg_terminate_backend)或关闭了连接。
+    """
+    if conn.closed:
+        return True
+    try:
+        readable, _, _ = select.select([conn], [], [], 0)
+    except (OSError, ValueError):
+        return True
+    return bool(readable)
+
+def reset_session(conn):
+    """清除调用方通过 SET、LISTEN、临时表等留在会话中的状态，保留已 PREPARE 的语句"""
+    conn.autocommit = True
+    with conn.cursor() as cursor:
+        cursor.execute(_SESSION_RESET_SQL)
+
+class IdleConnectionPool(ThreadedConnectionPool):
+    """归还的连接全部保留在池中复用
+
+    psycopg2 的连接池在空闲连接达到 minconn 后会直接关闭归还的连接，并发请求仍需重新建立连接；
+    这里只要连接可用就重置会话状态后放回池中，连接总数仍由 maxconn 限制。淘汰(retire)后的连接池不再保留连接。
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.retired = False
+
+    def _putconn(self, conn, key=None, close=False):
+        if key is None:
+            key = self._rused.get(id(conn))
+            if key is None:
+                raise PoolError("trying to put unkeyed connection")
+
+        if close or self.closed or self.retired or conn.closed or _idle_connection_count() >= POOL_MAX_CONN:
+            # 所有连接池的空闲连接总数不超过 POOL_MAX_CONN
+            conn.close()
+        else:
+            status = conn.info.transaction_status
+            if status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+                # 与服务器的连接已断开
+                conn.close()
+            else:
+                try:
+                    if status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                        conn.rollback()
+                    reset_session(conn)
+                    self._pool.append(conn)
+                except Error:
+                    conn.close()
+
+        del self._used[key]
+        del self._rused[id(conn)]
+
+    def _getconn(self, key=None):
+        # 丢弃在池中空闲期间被服务器关闭的连接，避免调用方拿到失效的连接
+        while self._pool and connection_lost(self._pool[-1]):
+            self._pool.pop().close()
+        return super()._getconn(key)
+
+    def retire(self):
+        """关闭空闲连接，正在使用的连接归还时直接关闭"""
+        with self._lock:
+            self.retired = True
+            for conn in self._pool:
+                conn.close()
+            self._pool.clear()
+
+def _idle_connection_count():
+    """所有连接池中空闲连接的总数"""
+    with _POOLS_LOCK:
+        return sum(len(pool._pool) for pool in _POOLS.values())
+
+def _get_pool(config):
+    """获取(必要时创建)与连接配置对应的连接池"""
+    with _POOLS_LOCK:
+        pool = _POOLS.get(config)
+        if pool is not None:
+            _POOLS.move_to_end(config)
+            return pool
+
+    # 在锁外建立连接，连接较慢的配置不会阻塞其他配置
+    pool = IdleConnectionPool(
+        POOL_MIN_CONN, POOL_MAX_CONN,
+        connection_factory=StatementCachingConnection,
+        **config.conn_params()
+    )
+    evicted = []
+    with _POOLS_LOCK:
+        existing = _POOLS.get(config)
+        if existing is not None:
+            # 其他线程已经创建了同一配置的连接池
+            evicted.append(pool)
+            pool = existing
+        else:
+            _POOLS[config] = pool
+            while len(_POOLS) > POOL_CACHE_SIZE:
+                evicted.append(_POOLS.popitem(last=False)[1])
+    for old_pool in evicted:
+        old_pool.retire()
+    return pool
+
+# DbConfig 中可以直接覆盖的字段，以及 libpq 参数名到字段名的映射
+_CONFIG_FIELDS = frozenset(field.name for field in fields(DbConfig)) - {"extra"}
+_CONFIG_ALIASES = {"dbname": "database"}
+
+@functools.lru_cache(maxsize=64)
+def _merge_config(base_config, overrides):
+    """合并全局/默认配置和调用方提供的配置项，相同的组合直接复用缓存的结果
+
+    DbConfig 字段以外的配置项作为 libpq 连接参数原样传给 psycopg2.connect。
+    """
+    known = {}
+    extra = dict(base_config.extra)
+    for name, value in overrides:
+        name = _CONFIG_ALIASES.get(name, name)
+        if name in _CONFIG_FIELDS:
+            known[name] = value
+        else:
+            extra[name] = value
+    return replace(base_config, extra=frozenset(extra.items()), **known)
+
+def resolve_config(db_config=None):
+    """确定本次调用使用的连接配置
+    
+    Args:
+        db_config: 数据库连接配置参数，如果为None则使用默认配置
+        
+    Returns:
+        DbConfig 对象
+    """
+    # 先尝试使用全局配置，再使用默认配置；只有提供了配置时才需要合并
+    config = GLOBAL_DB_CONFIG if GLOBAL_DB_CONFIG is not None else DEFAULT_DB_CONFIG
+    if db_config:
+        try:
+            config = _merge_config(config, frozenset(db_config.items()))
+        except TypeError as e:
+            raise Exception(f"数据库连接配置错误: {e}")
+    return config
+
+def _is_transient(error):
+    """判断获取连接时的错误是否可能通过重试恢复"""
+    if isinstance(error, PoolError):
+        # 连接池中的连接暂时用尽
+        return True
+    if error.pgcode:
+        return (error.pgcode[:2] == errorcodes.CLASS_CONNECTION_EXCEPTION
+                or error.pgcode in (errorcodes.CANNOT_CONNECT_NOW, errorcodes.TOO_MANY_CONNECTIONS))
+    if not isinstance(error, psycopg2.OperationalError):
+        return False
+    message = str(error).lower()
+    return not any(text in message for text in _PERMANENT_CONNECT_ERRORS)
+
 def get_connection(db_config=None):
     """获取数据库连接
     
@@ -68,60 +373,311 @@ def get_connection(db_config=None):
         db_config: 数据库连接配置参数，如果为None则使用默认配置
         
     Returns:
-        数据库连接对象
+        (数据库连接对象, 连接池)，使用完毕后需调用 pool.putconn(conn) 归还连接
     """
-    # 如果没有提供配置，先尝试使用全局配置，再使用默认配置
-    if db_config is None:
-        if GLOBAL_DB_CONFIG is not None:
-            db_config = GLOBAL_DB_CONFIG.copy()
-        else:
-            db_config = DEFAULT_DB_CONFIG.copy()
-    else:
-        # 合并用户提供的配置和全局/默认配置
-        if GLOBAL_DB_CONFIG is not None:
-            config = GLOBAL_DB_CONFIG.copy()
-        else:
-            config = DEFAULT_DB_CONFIG.copy()
-        config.update(db_config)
-        db_config = config
+    config = resolve_config(db_config)
     
     retry_count = 0
     last_error = None
-    max_retries = db_config.pop("connect_retry_count", 3)
+    max_retries = config.connect_retry_count
     
     while retry_count < max_retries:
         try:
-            # 创建一个配置字典的副本
-            conn_params = db_config.copy()
-                
-            conn = psycopg2.connect(**conn_params)
-            return conn
+            pool = _get_pool(config)
+            conn = pool.getconn()
+            # 丢弃已断开的连接
+            if conn.closed or conn.info.transaction_status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+                pool.putconn(conn, close=True)
+                raise psycopg2.OperationalError("连接池中的连接已断开")
+            # 确保在事务中执行，由调用方统一提交
+            conn.autocommit = False
+            return conn, pool
         except Error as e:
             last_error = e
             retry_count += 1
-            if retry_count < max_retries:
-                # 只有在还有重试机会的情况下打印重试信息
-                print(f"第 {retry_count} 次连接失败，正在重试... 错误: {e}")
+            # 认证失败、数据库不存在等错误重试也不会成功，直接报错
+            if retry_count >= max_retries or not _is_transient(e):
+                break
+            # 指数退避，避免在服务器不可用时连续重连
+            delay = min(2 ** (retry_count - 1) * 0.05, 1.0)
+            logger.warning("第 %d 次连接失败，%.2f 秒后重试... 错误: %s", retry_count, delay, e)
+            time.sleep(delay)
     
     # 所有重试都失败后，构建详细的错误信息
     error_message = f"数据库连接错误(重试 {retry_count} 次后): {last_error}"
-    if "connection refused" in str(last_error).lower():
-        error_message += f"\n无法连接到PostgreSQL服务器，请检查主机 {db_config['host']} 和端口 {db_config['port']} 是否正确"
-        error_message += f"\n连接超时时间为 {db_config.get('connect_timeout', 10)} 秒"
-    elif "password authentication failed" in str(last_error).lower():
-        error_message += f"\n认证失败，请检查用户名 {db_config['user']} 和密码是否正确"
-    elif "does not exist" in str(last_error).lower() and "database" in str(last_error).lower():
-        error_message += f"\n未知数据库 {db_config['database']}，请确认数据库名称是否正确"
+    # 优先根据 SQLSTATE 判断；建立连接阶段的错误通常没有 SQLSTATE，再根据错误信息判断
+    error_code = getattr(last_error, "pgcode", None)
+    error_text = str(last_error).lower()
+    if error_code == errorcodes.CONNECTION_FAILURE or "connection refused" in error_text:
+        error_message += f"\n无法连接到PostgreSQL服务器，请检查主机 {config.host} 和端口 {config.port} 是否正确"
+        error_message += f"\n连接超时时间为 {config.connect_timeout} 秒"
+    elif error_code == errorcodes.INVALID_PASSWORD or "password authentication failed" in error_text:
+        error_message += f"\n认证失败，请检查用户名 {config.user} 和密码是否正确"
+    elif error_code == errorcodes.INVALID_CATALOG_NAME or ("does not exist" in error_text and "database" in error_text):
+        error_message += f"\n未知数据库 {config.database}，请确认数据库名称是否正确"
     raise Exception(error_message)
 
+def _statement_verb(query):
+    """返回SQL语句的第一个关键字(大写)，只处理语句开头而不是整条SQL"""
+    match = _FIRST_WORD_RE.match(query)
+    return match.group(1).upper() if match else ""
+
+def _to_positional(query):
+    """将 psycopg2 风格的 %s 占位符转换为 PREPARE 使用的 $1..$n
+
+    Returns:
+        (转换后的SQL, 占位符数量)，包含无法转换的占位符时返回 (None, 0)
+    """
+    counter = itertools.count(1)
+    unsupported = False
+
+    def substitute(match):
+        nonlocal unsupported
+        token = match.group(1)
+        if token == "%":
+            return "%"
+        if token == "s":
+            return f"${next(counter)}"
+        unsupported = True
+        return match.group(0)
+
+    positional = _PLACEHOLDER_RE.sub(substitute, query)
+    if unsupported:
+        return None, 0
+    return positional, next(counter) - 1
+
+def _param_type(value):
+    """PREPARE 时声明的参数类型，与 psycopg2 把该值内联为字面量时 PostgreSQL 推断出的类型一致
+
+    字符串和 None 内联后是未定类型的字面量，对应 unknown，由上下文决定类型；
+    无法对应的值(如数组)返回None，此时不使用 PREPARE。
+    """
+    if value is None or isinstance(value, str):
+        return "unknown"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, int):
+        # 整数常量按大小依次为 integer、bigint、numeric
+        if -2 ** 31 <= value < 2 ** 31:
+            return "integer"
+        if -2 ** 63 <= value < 2 ** 63:
+            return "bigint"
+        return "numeric"
+    if isinstance(value, float):
+        # 有限浮点数内联为 1.5 这样的 numeric 常量，inf/nan 内联为 'Infinity'::float
+        return "numeric" if math.isfinite(value) else "double precision"
+    return None
+
+def execute_prepared(conn, cursor, query, params):
+    """通过服务端预处理语句执行参数化查询
+
+    同一连接上重复执行的查询只在第一次 PREPARE 时解析和规划，之后直接 EXECUTE。
+    无参数的查询、DDL 以及无法 PREPARE 的语句按普通方式执行。
+    """
+    cache = getattr(conn, "statement_cache", None)
+    if cache is None or not params or STATEMENT_CACHE_SIZE <= 0:
+        cursor.execute(query, params)
+        return
+
+    # 参数类型不同时语义可能不同(如 int_col > 9.5)，因此按 SQL 文本和参数类型分别缓存
+    statement = query.strip().rstrip(";").strip()
+    param_types = tuple(_param_type(value) for value in params)
+    key = (statement, param_types)
+    if key in cache:
+        cache.move_to_end(key)
+        name = cache[key]
+    else:
+        name = None
+        positional, count = _to_positional(statement)
+        if (_statement_verb(statement) in _PREPARABLE_VERBS and ";" not in statement
+                and positional is not None and count == len(params)
+                and None not in param_types
+                and not _POSITIONAL_PLACEHOLDER_RE.search(statement)):
+            digest = hashlib.blake2b(repr(key).encode(), digest_size=8).hexdigest()
+            name = "s_" + digest
+            try:
+                cursor.execute(f"PREPARE {name}({', '.join(param_types)}) AS {positional}")
+            except Error:
+                # 例如参数类型无法推断，回退为普通执行；连接刚从池中取出，回滚不会丢失其他操作
+                conn.rollback()
+                name = None
+        cache[key] = name
+        while len(cache) > STATEMENT_CACHE_SIZE:
+            _, evicted = cache.popitem(last=False)
+            if evicted is not None:
+                try:
+                    cursor.execute(f"DEALLOCATE {evicted}")
+                except Error as e:
+                    # 语句已不在会话中，无需释放
+                    if e.pgcode != errorcodes.INVALID_SQL_STATEMENT_NAME:
+                        raise
+                    conn.rollback()
+
+    if name is None:
+        cursor.execute(query, params)
+        return
+
+    placeholders = ", ".join(["%s"] * len(params))
+    try:
+        cursor.execute(f"EXECUTE {name}({placeholders})", params)
+    except Error as e:
+        if e.pgcode not in (errorcodes.FEATURE_NOT_SUPPORTED, errorcodes.INVALID_SQL_STATEMENT_NAME):
+            raise
+        # 表结构变更后 "cached plan must not change result type"，或语句已不在会话中，丢弃该语句后重新执行
+        conn.rollback()
+        if e.pgcode == errorcodes.FEATURE_NOT_SUPPORTED:
+            cursor.execute(f"DEALLOCATE {name}")
+        cache.pop(key, None)
+        cursor.execute(query, params)
+
+def reset_statement_cache(conn, cursor):
+    """调用方执行 DEALLOCATE/DISCARD 后，释放会话中全部预处理语句并清空缓存，使两者保持一致"""
+    cache = getattr(conn, "statement_cache", None)
+    if cache:
+        cursor.execute("DEALLOCATE ALL")
+        cache.clear()
+
+def check_identifiers(*names):
+    """检查标识符是否合法，返回第一个不合法标识符对应的错误结果，全部合法时返回None"""
+    for name in names:
+        if not isinstance(name, str) or not _IDENT_RE.fullmatch(name):
+            return {"error": f"无效的标识符: {name}，只能包含字母、数字和下划线，且不能以数字开头"}
+    return None
+
+@functools.lru_cache(maxsize=1024)
+def qualified_name(schema_name, table_name):
+    """组合加引号的 模式.表名，同一张表重复使用同一个 sql.Composed 对象"""
+    return sql.SQL("{}.{}").format(sql.Identifier(schema_name), sql.Identifier(table_name))
+
+def _copy_field(value):
+    """将值转换为 COPY 文本格式的字段，None 写为 \\N，并转义反斜杠和分隔字符"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        # 与 psycopg2 的适配结果一致，写入文本列时同样为 true/false
+        return "true" if value else "false"
+    return (str(value).replace("\\", "\\\\").replace("\t", "\\t")
+            .replace("\n", "\\n").replace("\r", "\\r"))
+
+def copy_compatible(cursor, schema_name, table_name, columns, rows):
+    """判断这些数据通过 COPY 写入的结果是否与 INSERT 相同，不同或无法确定时返回False"""
+    value_types = [set() for _ in columns]
+    for row in rows:
+        for types, value in zip(value_types, row):
+            types.add(type(value))
+    for types in value_types:
+        if not types.issubset(_COPY_COLUMN_TYPES):
+            return False
+    if any(isinstance(value, float) and not math.isfinite(value) for row in rows for value in row):
+        # inf/nan 在 INSERT 中写作 'Infinity'::float，文本形式不一定能被列类型解析
+        return False
+    cursor.execute("""
+        SELECT a.attname, format_type(a.atttypid, NULL), a.attidentity, c.relkind, c.relhasrules
+        FROM pg_catalog.pg_attribute a
+        JOIN pg_catalog.pg_class c ON c.oid = a.attrelid
+        JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = %s AND c.relname = %s AND a.attnum > 0 AND NOT a.attisdropped
+    """, (schema_name, table_name))
+    attributes = cursor.fetchall()
+    if not attributes:
+        return False
+    _, _, _, relkind, relhasrules = attributes[0]
+    # COPY 不能写入视图，也不会触发 ON INSERT 规则，只用于普通表和分区表
+    if relkind not in ("r", "p") or relhasrules:
+        return False
+    column_types = {name: data_type for name, data_type, _, _, _ in attributes}
+    # COPY 会写入 GENERATED ALWAYS 标识列的值，INSERT 则会拒绝
+    always_identity = {name for name, _, identity, _, _ in attributes if identity == "a"}
+    for column, types in zip(columns, value_types):
+        if column not in column_types or column in always_identity:
+            return False
+        for value_type in types:
+            allowed = _COPY_COLUMN_TYPES[value_type]
+            if allowed is not None and column_types[column] not in allowed:
+                return False
+    return True
+
+def copy_rows(cursor, target, columns, rows):
+    """通过 COPY FROM STDIN 批量写入数据，整个数据集作为一个数据流发送，服务器无需逐条解析INSERT"""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(map(_copy_field, row)))
+        buffer.write("\n")
+    buffer.seek(0)
+    statement = sql.SQL("COPY {} ({}) FROM STDIN").format(
+        target,
+        sql.SQL(", ").join(map(sql.Identifier, columns))
+    )
+    cursor.copy_expert(statement, buffer)
+
+def fetch_dicts(cursor):
+    """以字典列表的形式获取结果集，每行只构造一个字典
+
+    按 cursor.itersize 分批读取，不会同时持有完整的元组列表和字典列表；
+    对服务端游标，每批只从服务器取回 itersize 行。
+    """
+    results = []
+    batch = cursor.fetchmany(cursor.itersize)
+    # 服务端游标在第一次读取之后才有 description
+    columns = [desc.name for desc in cursor.description]
+    while batch:
+        results.extend(dict(zip(columns, row)) for row in batch)
+        if len(batch) < cursor.itersize:
+            # 不足一批说明已读完，服务端游标不必再发一次 FETCH
+            break
+        batch = cursor.fetchmany(cursor.itersize)
+    return results
+
+def get_cached_metadata(key):
+    """获取未过期的元数据查询结果，没有缓存时返回None"""
+    if METADATA_CACHE_TTL <= 0:
+        return None
+    with _METADATA_CACHE_LOCK:
+        entry = _METADATA_CACHE.get(key)
+    if entry is None or entry[0] < time.monotonic():
+        return None
+    return entry[1]
+
+def set_cached_metadata(key, result):
+    """缓存元数据查询结果，超过容量时先清理过期项，再淘汰最早的缓存"""
+    if METADATA_CACHE_TTL <= 0:
+        return
+    now = time.monotonic()
+    with _METADATA_CACHE_LOCK:
+        if len(_METADATA_CACHE) >= METADATA_CACHE_SIZE:
+            for expired in [k for k, (expires, _) in _METADATA_CACHE.items() if expires < now]:
+                del _METADATA_CACHE[expired]
+            if len(_METADATA_CACHE) >= METADATA_CACHE_SIZE:
+                del _METADATA_CACHE[next(iter(_METADATA_CACHE))]
+        _METADATA_CACHE[key] = (now + METADATA_CACHE_TTL, result)
+
+def clear_metadata_cache():
+    """表结构可能发生变化时清空元数据缓存"""
+    with _METADATA_CACHE_LOCK:
+        _METADATA_CACHE.clear()
+
+def run_in_thread(func):
+    """将阻塞的数据库操作放到工作线程中执行，避免阻塞事件循环
+
+    psycopg2 的调用都是同步阻塞的，直接在 async 工具中执行会让所有请求在事件循环上串行。
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_EXECUTOR, functools.partial(func, *args, **kwargs))
+    return wrapper
+
 @mcp.tool()
-async def execute_query(query: str, params: Optional[List[Any]] = None, db_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+@run_in_thread
+def execute_query(query: str, params: Optional[List[Any]] = None, db_config: Optional[Dict[str, Any]] = None,
+                  server_cursor: bool = False) -> Dict[str, Any]:
     """执行SQL查询语句，返回查询结果
 
     Args:
         query: SQL查询语句
         params: 查询参数，用于参数化查询，防止SQL注入
         db_config: 数据库连接配置参数，如果为None则使用默认配置
+        server_cursor: 是否使用服务端游标分批读取结果，适用于结果集很大的单条查询
 
     Returns:
         包含查询结果的字典
@@ -132,17 +688,28 @@ async def execute_query(query: str, params: Optional[List[Any]] = None, db_confi
     if params is None:
         params = []
     
+    conn = None
+    cursor = None
     try:
-        conn = get_connection(db_config)
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        cursor.execute(query, params)
+        conn, pool = get_connection(db_config)
+        verb = _statement_verb(query)
+        if server_cursor and verb in _SERVER_CURSOR_VERBS and ";" not in query.strip().rstrip(";"):
+            # 服务端游标分批传输结果集，避免一次性读入内存，但需要额外的 DECLARE/FETCH/CLOSE 往返
+            cursor = conn.cursor(name=f"c_{uuid.uuid4().hex}")
+            cursor.itersize = FETCH_SIZE
+            cursor.execute(query, params)
+            returns_rows = True
+        else:
+            cursor = conn.cursor()
+            execute_prepared(conn, cursor, query, params)
+            returns_rows = verb in _READ_VERBS and cursor.description is not None
         
         # 判断是否是需要返回结果集的查询
-        query_upper = query.strip().upper()
-        if query_upper.startswith("SELECT") or query_upper.startswith("SHOW") or query_upper.startswith("DESCRIBE") or query_upper.startswith("EXPLAIN"):
-            results = cursor.fetchall()
-            # 将结果转为字典列表
-            dict_results = [dict(row) for row in results]
+        if returns_rows:
+            dict_results = fetch_dicts(cursor)
+            if verb == "WITH":
+                # CTE 中可能包含数据修改语句
+                conn.commit()
             return {
                 "success": True,
                 "rows": dict_results,
@@ -150,29 +717,35 @@ async def execute_query(query: str, params: Optional[List[Any]] = None, db_confi
             }
         else:
             # 对于非查询性质的SQL，如INSERT, UPDATE, DELETE等
+            if verb in _DEALLOCATE_VERBS:
+                reset_statement_cache(conn, cursor)
             conn.commit()
+            if verb in _DDL_VERBS:
+                clear_metadata_cache()
             return {
                 "success": True,
                 "affected_rows": cursor.rowcount
             }
     except Error as e:
         error_message = f"执行查询失败: {str(e)}"
-        if "column" in str(e).lower() and "does not exist" in str(e).lower():
+        if e.pgcode == errorcodes.UNDEFINED_COLUMN:
             error_message += "\n原因：查询中包含未知的列名"
-        elif "relation" in str(e).lower() and "does not exist" in str(e).lower():
+        elif e.pgcode == errorcodes.UNDEFINED_TABLE:
             error_message += "\n原因：查询的表不存在"
-        elif "syntax error" in str(e).lower():
+        elif e.pgcode == errorcodes.SYNTAX_ERROR:
             error_message += "\n原因：SQL语法错误"
         return {"error": error_message, "query": query}
     except Exception as e:
         return {"error": f"执行过程中发生未知错误: {str(e)}", "query": query}
     finally:
-        if 'conn' in locals() and not conn.closed:
+        if cursor is not None:
             cursor.close()
-            conn.close()
+        if conn is not None:
+            pool.putconn(conn)
 
 @mcp.tool()
-async def list_tables(schema_name: str = "public", db_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+@run_in_thread
+def list_tables(schema_name: str = "public", db_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """列出指定模式中的所有表
     
     Args:
@@ -182,40 +755,52 @@ async def list_tables(schema_name: str = "public", db_config: Optional[Dict[str,
     Returns:
         包含表列表的字典
     """
+    conn = None
+    cursor = None
     try:
-        conn = get_connection(db_config)
+        cache_key = ("list_tables", resolve_config(db_config), schema_name)
+        result = get_cached_metadata(cache_key)
+        if result is not None:
+            return result
+        
+        conn, pool = get_connection(db_config)
         cursor = conn.cursor()
         
-        # 查询指定模式的表
+        # 查询指定模式的表(普通表、分区表、视图、外部表)，直接查询系统表比 information_schema 视图快得多
         cursor.execute("""
-            SELECT table_name 
-            FROM information_schema.tables 
-            WHERE table_schema = %s
-            ORDER BY table_name
+            SELECT c.relname AS table_name
+            FROM pg_catalog.pg_class c
+            JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = %s AND c.relkind IN ('r', 'p', 'v', 'f')
+            ORDER BY c.relname
         """, (schema_name,))
             
         tables = [table[0] for table in cursor.fetchall()]
         
-        return {
+        result = {
             "success": True,
             "schema": schema_name,
             "tables": tables,
             "count": len(tables)
         }
+        set_cached_metadata(cache_key, result)
+        return result
     except Error as e:
         error_message = f"获取表列表失败: {str(e)}"
-        if "permission denied" in str(e).lower():
+        if e.pgcode == errorcodes.INSUFFICIENT_PRIVILEGE:
             error_message += "\n原因：当前用户没有足够权限执行查询"
         return {"error": error_message}
     except Exception as e:
         return {"error": f"获取表列表时发生未知错误: {str(e)}"}
     finally:
-        if 'conn' in locals() and not conn.closed:
+        if cursor is not None:
             cursor.close()
-            conn.close()
+        if conn is not None:
+            pool.putconn(conn)
 
 @mcp.tool()
-async def describe_table(table_name: str, schema_name: str = "public", db_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+@run_in_thread
+def describe_table(table_name: str, schema_name: str = "public", db_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """获取表结构
     
     Args:
@@ -229,58 +814,85 @@ async def describe_table(table_name: str, schema_name: str = "public", db_config
     if not table_name:
         return {"error": "表名不能为空"}
         
+    conn = None
+    cursor = None
     try:
-        conn = get_connection(db_config)
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        cache_key = ("describe_table", resolve_config(db_config), schema_name, table_name)
+        result = get_cached_metadata(cache_key)
+        if result is not None:
+            return result
+        
+        conn, pool = get_connection(db_config)
+        cursor = conn.cursor()
         
-        # 查询表结构
+        # 查询表结构，主键信息在同一条查询中返回，只需一次往返
         cursor.execute("""
             SELECT 
-                column_name, 
-                data_type, 
-                character_maximum_length,
-                column_default,
-                is_nullable
-            FROM information_schema.columns 
-            WHERE table_schema = %s AND table_name = %s
-            ORDER BY ordinal_position
+                a.attname AS column_name, 
+                pg_catalog.format_type(a.atttypid, NULL) AS data_type, 
+                CASE WHEN a.atttypid IN ('bpchar'::regtype, 'varchar'::regtype) AND a.atttypmod > 0
+                     THEN a.atttypmod - 4 END AS character_maximum_length,
+                pg_catalog.pg_get_expr(d.adbin, d.adrelid) AS column_default,
+                CASE WHEN a.attnotnull THEN 'NO' ELSE 'YES' END AS is_nullable,
+                EXISTS (
+                    SELECT 1 FROM pg_catalog.pg_index i
+                    WHERE i.indrelid = c.oid AND i.indisprimary AND a.attnum = ANY(i.indkey)
+                ) AS is_primary_key
+            FROM pg_catalog.pg_class c
+            JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+            LEFT JOIN pg_catalog.pg_attribute a ON a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+            LEFT JOIN pg_catalog.pg_attrdef d ON d.adrelid = a.attrelid AND d.adnum = a.attnum
+            WHERE n.nspname = %s AND c.relname = %s AND c.relkind IN ('r', 'p', 'v', 'f')
+            ORDER BY a.attnum
         """, (schema_name, table_name))
         
-        columns = cursor.fetchall()
+        # 表存在时至少返回一行，没有列的表返回一行列名为 NULL 的记录
+        rows = cursor.fetchall()
+        if not rows:
+            return {"error": f"获取表结构失败: 表 {schema_name}.{table_name} 不存在"}
         
-        # 获取主键信息
-        cursor.execute("""
-            SELECT a.attname as column_name
-            FROM pg_index i
-            JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
-            WHERE i.indrelid = %s::regclass AND i.indisprimary
-        """, (f"{schema_name}.{table_name}",))
-        
-        primary_keys = [pk['column_name'] for pk in cursor.fetchall()]
+        columns = []
+        primary_keys = []
+        for column_name, data_type, max_length, column_default, is_nullable, is_primary_key in rows:
+            if column_name is None:
+                continue
+            columns.append({
+                "column_name": column_name,
+                "data_type": data_type,
+                "character_maximum_length": max_length,
+                "column_default": column_default,
+                "is_nullable": is_nullable
+            })
+            if is_primary_key:
+                primary_keys.append(column_name)
         
-        return {
+        result = {
             "success": True,
             "table": table_name,
             "schema": schema_name,
-            "columns": [dict(col) for col in columns],
+            "columns": columns,
             "primary_keys": primary_keys
         }
+        set_cached_metadata(cache_key, result)
+        return result
     except Error as e:
         error_message = f"获取表结构失败: {str(e)}"
-        if "does not exist" in str(e).lower():
+        if e.pgcode == errorcodes.UNDEFINED_TABLE:
             error_message += f"\n原因：表 {schema_name}.{table_name} 不存在"
-        elif "permission denied" in str(e).lower():
+        elif e.pgcode == errorcodes.INSUFFICIENT_PRIVILEGE:
             error_message += "\n原因：当前用户没有足够权限查看表结构"
         return {"error": error_message}
     except Exception as e:
         return {"error": f"获取表结构时发生未知错误: {str(e)}"}
     finally:
-        if 'conn' in locals() and not conn.closed:
+        if cursor is not None:
             cursor.close()
-            conn.close()
+        if conn is not None:
+            pool.putconn(conn)
 
 @mcp.tool()
-async def list_schemas(db_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+@run_in_thread
+def list_schemas(db_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """列出数据库中的所有模式
     
     Args:
@@ -289,38 +901,49 @@ async def list_schemas(db_config: Optional[Dict[str, Any]] = None) -> Dict[str,
     Returns:
         包含模式列表的字典
     """
+    conn = None
+    cursor = None
     try:
-        conn = get_connection(db_config)
+        cache_key = ("list_schemas", resolve_config(db_config))
+        result = get_cached_metadata(cache_key)
+        if result is not None:
+            return result
+        
+        conn, pool = get_connection(db_config)
         cursor = conn.cursor()
         
         # 查询所有非系统模式
         cursor.execute("""
-            SELECT schema_name 
-            FROM information_schema.schemata 
-            WHERE schema_name NOT LIKE 'pg_%' 
-              AND schema_name != 'information_schema'
-            ORDER BY schema_name
+            SELECT nspname AS schema_name 
+            FROM pg_catalog.pg_namespace 
+            WHERE nspname NOT LIKE 'pg_%' 
+              AND nspname != 'information_schema'
+            ORDER BY nspname
         """)
             
         schemas = [schema[0] for schema in cursor.fetchall()]
         
-        return {
+        result = {
             "success": True,
             "schemas": schemas,
             "count": len(schemas)
         }
+        set_cached_metadata(cache_key, result)
+        return result
     except Error as e:
         error_message = f"获取模式列表失败: {str(e)}"
         return {"error": error_message}
     except Exception as e:
         return {"error": f"获取模式列表时发生未知错误: {str(e)}"}
     finally:
-        if 'conn' in locals() and not conn.closed:
+        if cursor is not None:
             cursor.close()
-            conn.close()
+        if conn is not None:
+            pool.putconn(conn)
 
 @mcp.tool()
-async def create_table(table_name: str, columns: List[Dict[str, Any]], schema_name: str = "public", if_not_exists: bool = True, db_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+@run_in_thread
+def create_table(table_name: str, columns: List[Dict[str, Any]], schema_name: str = "public", if_not_exists: bool = True, db_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """创建数据表
     
     Args:
@@ -339,10 +962,15 @@ async def create_table(table_name: str, columns: List[Dict[str, Any]], schema_na
     if not columns or not isinstance(columns, list) or len(columns) == 0:
         return {"error": "列定义不能为空"}
     
+    error = check_identifiers(schema_name, table_name)
+    if error is not None:
+        return error
+    
+    conn = None
+    cursor = None
     try:
-        # 构建CREATE TABLE语句
-        not_exists_clause = "IF NOT EXISTS " if if_not_exists else ""
-        sql = f"CREATE TABLE {not_exists_clause}{schema_name}.{table_name} ("
+        # 构建CREATE TABLE语句，表名和列名作为标识符加引号，类型和默认值按原样拼接
+        not_exists_clause = sql.SQL("IF NOT EXISTS " if if_not_exists else "")
         
         column_defs = []
         primary_keys = []
@@ -351,30 +979,41 @@ async def create_table(table_name: str, columns: List[Dict[str, Any]], schema_na
             if not col.get("name") or not col.get("type"):
                 return {"error": "每个列定义必须包含name和type字段"}
             
-            col_def = f"{col['name']} {col['type']}"
+            error = check_identifiers(col['name'])
+            if error is not None:
+                return error
+            
+            col_def = [sql.Identifier(col['name']), sql.SQL(col['type'])]
             
             if col.get("primary_key"):
                 primary_keys.append(col['name'])
             
             if col.get("nullable") is False:
-                col_def += " NOT NULL"
+                col_def.append(sql.SQL("NOT NULL"))
             
             if "default" in col:
-                col_def += f" DEFAULT {col['default']}"
+                col_def.append(sql.SQL(f"DEFAULT {col['default']}"))
                 
-            column_defs.append(col_def)
+            column_defs.append(sql.SQL(" ").join(col_def))
         
         # 添加主键约束
         if primary_keys:
-            column_defs.append(f"PRIMARY KEY ({', '.join(primary_keys)})")
+            column_defs.append(sql.SQL("PRIMARY KEY ({})").format(
+                sql.SQL(", ").join(map(sql.Identifier, primary_keys))
+            ))
             
-        sql += ", ".join(column_defs) + ")"
+        statement = sql.SQL("CREATE TABLE {}{} ({})").format(
+            not_exists_clause,
+            qualified_name(schema_name, table_name),
+            sql.SQL(", ").join(column_defs)
+        )
         
         # 执行SQL
-        conn = get_connection(db_config)
+        conn, pool = get_connection(db_config)
         cursor = conn.cursor()
-        cursor.execute(sql)
+        cursor.execute(statement)
         conn.commit()
+        clear_metadata_cache()
         
         return {
             "success": True,
@@ -382,20 +1021,22 @@ async def create_table(table_name: str, columns: List[Dict[str, Any]], schema_na
         }
     except Error as e:
         error_message = f"创建表失败: {str(e)}"
-        if "already exists" in str(e).lower():
+        if e.pgcode == errorcodes.DUPLICATE_TABLE:
             error_message += f"\n原因：表 {schema_name}.{table_name} 已存在"
-        elif "syntax error" in str(e).lower():
+        elif e.pgcode == errorcodes.SYNTAX_ERROR:
             error_message += "\n原因：SQL语法错误，请检查列定义"
         return {"error": error_message}
     except Exception as e:
         return {"error": f"创建表时发生未知错误: {str(e)}"}
     finally:
-        if 'conn' in locals() and not conn.closed:
+        if cursor is not None:
             cursor.close()
-            conn.close()
+        if conn is not None:
+            pool.putconn(conn)
 
 @mcp.tool()
-async def insert_data(table_name: str, data: Union[Dict[str, Any], List[Dict[str, Any]]], schema_name: str = "public", db_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+@run_in_thread
+def insert_data(table_name: str, data: Union[Dict[str, Any], List[Dict[str, Any]]], schema_name: str = "public", db_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """向表中插入数据
     
     Args:
@@ -420,27 +1061,41 @@ async def insert_data(table_name: str, data: Union[Dict[str, Any], List[Dict[str
     if not all(isinstance(item, dict) for item in data):
         return {"error": "数据格式错误，应为字典或字典列表"}
     
+    # 获取第一条记录的列名作为参考
+    columns = list(data[0].keys())
+    
+    error = check_identifiers(schema_name, table_name, *columns)
+    if error is not None:
+        return error
+    
+    conn = None
+    cursor = None
     try:
-        conn = get_connection(db_config)
+        conn, pool = get_connection(db_config)
         cursor = conn.cursor()
         
-        # 获取第一条记录的列名作为参考
-        columns = list(data[0].keys())
-        
         # 构建INSERT语句
-        placeholders = ", ".join(["%s"] * len(columns))
-        column_str = ", ".join(columns)
-        
-        sql = f"INSERT INTO {schema_name}.{table_name} ({column_str}) VALUES ({placeholders})"
+        template = "(" + ", ".join(["%s"] * len(columns)) + ")"
+        statement = sql.SQL("INSERT INTO {} ({}) VALUES ").format(
+            qualified_name(schema_name, table_name),
+            sql.SQL(", ").join(map(sql.Identifier, columns))
+        )
         
         # 准备数据
-        values = []
-        for item in data:
-            row_values = [item.get(col) for col in columns]
-            values.append(row_values)
+        values = [tuple(item.get(col) for col in columns) for item in data]
         
-        # 执行批量插入
-        cursor.executemany(sql, values)
+        if len(values) > COPY_THRESHOLD and copy_compatible(cursor, schema_name, table_name, columns, values):
+            # 数据量很大且写入结果与 INSERT 相同时使用 COPY 写入
+            copy_rows(cursor, qualified_name(schema_name, table_name), columns, values)
+        elif len(values) <= INSERT_PAGE_SIZE:
+            # 数据量不大时直接拼接为一条多行INSERT语句，一次往返完成
+            encoding = psycopg2.extensions.encodings[conn.encoding]
+            rows = b",".join(cursor.mogrify(template, row) for row in values)
+            cursor.execute(statement.as_string(conn).encode(encoding) + rows)
+        else:
+            # 执行批量插入，每批数据合并为一条多行INSERT语句
+            execute_values(cursor, statement + sql.SQL("%s"), values, template=template, page_size=INSERT_PAGE_SIZE)
+        # 所有批次在同一事务中，只提交一次
         conn.commit()
         
         return {
@@ -449,23 +1104,27 @@ async def insert_data(table_name: str, data: Union[Dict[str, Any], List[Dict[str
             "message": f"成功向表 {schema_name}.{table_name} 插入 {len(data)} 条数据"
         }
     except Error as e:
+        if conn is not None and not conn.closed:
+            conn.rollback()
         error_message = f"插入数据失败: {str(e)}"
-        if "does not exist" in str(e).lower():
+        if e.pgcode == errorcodes.UNDEFINED_TABLE:
             error_message += f"\n原因：表 {schema_name}.{table_name} 不存在"
-        elif "violates" in str(e).lower() and "constraint" in str(e).lower():
+        elif (e.pgcode or "")[:2] == errorcodes.CLASS_INTEGRITY_CONSTRAINT_VIOLATION:
             error_message += "\n原因：违反表约束条件"
-        elif "column" in str(e).lower() and "does not exist" in str(e).lower():
+        elif e.pgcode == errorcodes.UNDEFINED_COLUMN:
             error_message += "\n原因：表中不存在指定的列"
         return {"error": error_message}
     except Exception as e:
         return {"error": f"插入数据时发生未知错误: {str(e)}"}
     finally:
-        if 'conn' in locals() and not conn.closed:
+        if cursor is not None:
             cursor.close()
-            conn.close()
+        if conn is not None:
+            pool.putconn(conn)
 
 @mcp.tool()
-async def update_data(table_name: str, data: Dict[str, Any], condition: str, params: Optional[List[Any]] = None, schema_name: str = "public", db_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+@run_in_thread
+def update_data(table_name: str, data: Dict[str, Any], condition: str, params: Optional[List[Any]] = None, schema_name: str = "public", db_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """更新表中的数据
     
     Args:
@@ -488,22 +1147,28 @@ async def update_data(table_name: str, data: Dict[str, Any], condition: str, par
     if not condition:
         return {"error": "更新条件不能为空，为了安全起见，必须提供WHERE条件"}
     
+    error = check_identifiers(schema_name, table_name, *data)
+    if error is not None:
+        return error
+    
+    conn = None
+    cursor = None
     try:
-        conn = get_connection(db_config)
+        conn, pool = get_connection(db_config)
         cursor = conn.cursor()
         
         # 构建SET子句
-        set_items = []
-        set_values = []
-        
-        for key, value in data.items():
-            set_items.append(f"{key} = %s")
-            set_values.append(value)
+        set_clause = sql.SQL(", ").join(
+            sql.SQL("{} = %s").format(sql.Identifier(key)) for key in data
+        )
+        set_values = list(data.values())
         
-        set_clause = ", ".join(set_items)
-        
-        # 构建完整SQL语句
-        sql = f"UPDATE {schema_name}.{table_name} SET {set_clause} WHERE {condition}"
+        # 构建完整SQL语句，WHERE条件按原样拼接
+        statement = sql.SQL("UPDATE {} SET {} WHERE {}").format(
+            qualified_name(schema_name, table_name),
+            set_clause,
+            sql.SQL(condition)
+        )
         
         # 合并参数
         all_params = set_values
@@ -511,7 +1176,7 @@ async def update_data(table_name: str, data: Dict[str, Any], condition: str, par
             all_params.extend(params)
         
         # 执行更新
-        cursor.execute(sql, all_params)
+        cursor.execute(statement, all_params)
         affected_rows = cursor.rowcount
         conn.commit()
         
@@ -522,19 +1187,20 @@ async def update_data(table_name: str, data: Dict[str, Any], condition: str, par
         }
     except Error as e:
         error_message = f"更新数据失败: {str(e)}"
-        if "does not exist" in str(e).lower():
+        if e.pgcode == errorcodes.UNDEFINED_TABLE:
             error_message += f"\n原因：表 {schema_name}.{table_name} 不存在"
-        elif "column" in str(e).lower() and "does not exist" in str(e).lower():
+        elif e.pgcode == errorcodes.UNDEFINED_COLUMN:
             error_message += "\n原因：尝试更新不存在的列"
-        elif "syntax error" in str(e).lower():
+        elif e.pgcode == errorcodes.SYNTAX_ERROR:
             error_message += "\n原因：SQL语法错误，请检查条件语句"
         return {"error": error_message}
     except Exception as e:
         return {"error": f"更新数据时发生未知错误: {str(e)}"}
     finally:
-        if 'conn' in locals() and not conn.closed:
+        if cursor is not None:
             cursor.close()
-            conn.close()
+        if conn is not None:
+            pool.putconn(conn)
 
 if __name__ == "__main__":
     # 初始化全局配置